@@ -1,17 +1,209 @@
+import asyncio
+import copy
+import functools
+import inspect
 import logging
+import sys
+import threading
+import time
+import types
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from pprint import pprint
 import boto3
-from boto3.dynamodb.conditions import Key
+import botocore.parsers
+import botocore.serialize
+from botocore.config import Config
 from botocore.exceptions import ClientError
 
+try:
+    import aioboto3
+except ImportError:
+    aioboto3 = None
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 logger = logging.getLogger(__name__)
 
+if orjson is not None:
+    # Give botocore's JSON parser and serializer orjson in place of the json
+    # module. Only their module references are swapped, so json itself is
+    # left alone for the rest of the process.
+    def _orjson_dumps(obj, **kwargs):
+        # orjson always writes compact output, which is what the separators
+        # keyword asks for.
+        return orjson.dumps(obj).decode()
+
+    _orjson_json = types.SimpleNamespace(loads=orjson.loads, dumps=_orjson_dumps)
+    botocore.parsers.json = _orjson_json
+    botocore.serialize.json = _orjson_json
+
+# Reuse pooled keep-alive connections across the scenario's round-trips.
+# Client-side parameter validation is skipped, on the assumption that callers
+# are trusted: items passed to write_batch, add_book and get_books reach
+# DynamoDB unchecked. The aioboto3 scenario uses this config too.
+DYNAMODB_CONFIG = Config(
+    tcp_keepalive=True,
+    max_pool_connections=50,
+    retries={'mode': 'adaptive', 'total_max_attempts': 3},
+    connect_timeout=5,
+    read_timeout=10,
+    parameter_validation=False)
+# Same settings with validation on, for development.
+VALIDATED_DYNAMODB_CONFIG = DYNAMODB_CONFIG.merge(Config(parameter_validation=True))
+
+# DynamoDB resources keyed by (endpoint_url, region, profile, validate), so
+# credentials and endpoints are resolved once per process.
+_RESOURCES = {}
+_RESOURCES_LOCK = threading.Lock()
+
+
+def _get_resource(endpoint_url, region=None, profile=None, validate=False):
+    key = (endpoint_url, region, profile, validate)
+    with _RESOURCES_LOCK:
+        resource = _RESOURCES.get(key)
+        if resource is None:
+            resource = _RESOURCES[key] = boto3.Session(profile_name=profile).resource(
+                'dynamodb', endpoint_url=endpoint_url, region_name=region,
+                config=VALIDATED_DYNAMODB_CONFIG if validate else DYNAMODB_CONFIG)
+    return resource
+
+
+# BatchWriteItem accepts at most 25 put requests per call.
+BATCH_WRITE_SIZE = 25
+# BatchGetItem accepts at most 100 keys per call.
+BATCH_GET_SIZE = 100
+# Number of books Books.get_book keeps in memory.
+BOOK_CACHE_SIZE = 1024
+# Keep the writer pool below the resource's max_pool_connections.
+MAX_WRITE_WORKERS = 16
+
+# The default TableExists waiter polls every 20 seconds, up to 25 times. Poll
+# every half second instead, so fast tables (DynamoDB Local creates them in well
+# under a second) don't sit idle, but keep the same 500 second limit for tables
+# that take longer to become active.
+TABLE_WAITER_CONFIG = {'Delay': 0.5, 'MaxAttempts': 1000}
+
+# Schema of the books table, shared by Books and AsyncBooks.
+_TABLE_DEFINITION = {
+    'KeySchema': [
+        {'AttributeName': 'isbn', 'KeyType': 'HASH'},  # Partition key
+        {'AttributeName': 'title', 'KeyType': 'RANGE'}  # Sort key
+    ],
+    'AttributeDefinitions': [
+        {'AttributeName': 'isbn', 'AttributeType': 'S'},
+        {'AttributeName': 'title', 'AttributeType': 'S'}
+    ],
+    'ProvisionedThroughput': {'ReadCapacityUnits': 10, 'WriteCapacityUnits': 10},
+}
+
+# (endpoint_url, table_name) pairs already known to exist in this process.
+_TABLE_CACHE = set()
+
+
+def _remember_table(key, table):
+    """
+    Adds a freshly loaded table to the table cache, unless it is being deleted;
+    such a table would otherwise stay cached after it's gone.
+    """
+    if table.meta.data.get('TableStatus') != 'DELETING':
+        _TABLE_CACHE.add(key)
+
+# Built once at import time and reused by every scenario run. boto3 deep-copies
+# request parameters before serializing them, so the dicts are never mutated.
+_SEED_BOOKS = (
+    {
+        "isbn": "9781593279509",
+        "title": "Eloquent JavaScript, Third Edition",
+        "subtitle": "A Modern Introduction to Programming",
+        "author": "Marijn Haverbeke",
+        "published": "2018-12-04T00:00:00.000Z",
+        "publisher": "No Starch Press",
+        "pages": 472,
+        "description": "JavaScript lies at the heart of almost every modern web application, from social apps like Twitter to browser-based game frameworks like Phaser and Babylon. Though simple for beginners to pick up and play with, JavaScript is a flexible, complex language that you can use to build full-scale applications.",
+        "website": "http://eloquentjavascript.net/"
+    },
+    {
+        "isbn": "9781491943533",
+        "title": "Practical Modern JavaScript",
+        "subtitle": "Dive into ES6 and the Future of JavaScript",
+        "author": "Nicolás Bevacqua",
+        "published": "2017-07-16T00:00:00.000Z",
+        "publisher": "O'Reilly Media",
+        "pages": 334,
+        "description": "To get the most out of modern JavaScript, you need learn the latest features of its parent specification, ECMAScript 6 (ES6). This book provides a highly practical look at ES6, without getting lost in the specification or its implementation details.",
+        "website": "https://github.com/mjavascript/practical-modern-javascript"
+    },
+    {
+        "isbn": "9781593277574",
+        "title": "Understanding ECMAScript 6",
+        "subtitle": "The Definitive Guide for JavaScript Developers",
+        "author": "Nicholas C. Zakas",
+        "published": "2016-09-03T00:00:00.000Z",
+        "publisher": "No Starch Press",
+        "pages": 352,
+        "description": "ECMAScript 6 represents the biggest update to the core of JavaScript in the history of the language. In Understanding ECMAScript 6, expert developer Nicholas C. Zakas provides a complete guide to the object types, syntax, and other exciting changes that ECMAScript 6 brings to JavaScript.",
+        "website": "https://leanpub.com/understandinges6/read"
+    },
+)
+
+
+_ERR_CLIENT_ERROR = "Couldn't %s. Here's why: %s: %s"
+
+
+def _log_client_error(action):
+    """
+    Logs a ClientError raised by the decorated method and re-raises it.
+
+    :param action: What the method was trying to do, used in the log message. It
+                   is formatted with the method's arguments and with `table`, the
+                   name of the object's current table.
+    """
+    def decorator(func):
+        signature = inspect.signature(func)
+
+        def log(err, args, kwargs):
+            arguments = signature.bind(*args, **kwargs).arguments
+            table = getattr(arguments.get('self'), 'table', None)
+            logger.error(
+                _ERR_CLIENT_ERROR,
+                action.format(table=getattr(table, 'name', None), **arguments),
+                err.response['Error']['Code'], err.response['Error']['Message'])
+
+        if inspect.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def wrapper(*args, **kwargs):
+                try:
+                    return await func(*args, **kwargs)
+                except ClientError as err:
+                    log(err, args, kwargs)
+                    raise
+        else:
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                try:
+                    return func(*args, **kwargs)
+                except ClientError as err:
+                    log(err, args, kwargs)
+                    raise
+        return wrapper
+    return decorator
+
 
 class Books:
     def __init__(self, dyn_resource):
         self.dyn_resource = dyn_resource
         self.table = None
+        # Recently read books keyed by (isbn, title), least recently used first.
+        self._cache = OrderedDict()
+
+    def _table_key(self, table_name):
+        return self.dyn_resource.meta.client.meta.endpoint_url, table_name
 
+    @_log_client_error('check for existence of {table_name}')
     def exists(self, table_name):
         """
         Determines whether a table exists. As a side effect, stores the table in
@@ -20,145 +212,275 @@ class Books:
         :param table_name: The name of the table to check.
         :return: True when the table exists; otherwise, False.
         """
-        try:
-            table = self.dyn_resource.Table(table_name)
-            table.load()
-            exists = True
-        except ClientError as err:
-            if err.response['Error']['Code'] == 'ResourceNotFoundException':
-                exists = False
-            else:
-                logger.error(
-                    "Couldn't check for existence of %s. Here's why: %s: %s",
-                    table_name,
-                    err.response['Error']['Code'], err.response['Error']['Message'])
-                raise
-        else:
-            self.table = table
-        return exists
+        key = self._table_key(table_name)
+        table = self.dyn_resource.Table(table_name)
+        self._cache.clear()
+        if key not in _TABLE_CACHE:
+            try:
+                table.load()
+            except ClientError as err:
+                if err.response['Error']['Code'] != 'ResourceNotFoundException':
+                    raise
+                return False
+            _remember_table(key, table)
+        self.table = table
+        return True
 
+    @_log_client_error('create table {table_name}')
     def create_table(self, table_name):
-        try:
-            self.table = self.dyn_resource.create_table(
-                TableName=table_name,
-                KeySchema=[
-                    {'AttributeName': 'isbn', 'KeyType': 'HASH'},  # Partition key
-                    {'AttributeName': 'title', 'KeyType': 'RANGE'}  # Sort key
-                ],
-                AttributeDefinitions=[
-                    {'AttributeName': 'isbn', 'AttributeType': 'S'},
-                    {'AttributeName': 'title', 'AttributeType': 'S'}
-                ],
-                ProvisionedThroughput={'ReadCapacityUnits': 10, 'WriteCapacityUnits': 10})
-            self.table.wait_until_exists()
-        except ClientError as err:
-            logger.error(
-                "Couldn't create table %s. Here's why: %s: %s", table_name,
-                err.response['Error']['Code'], err.response['Error']['Message'])
-            raise
-        else:
-            return self.table
+        self.table = self.dyn_resource.create_table(
+            TableName=table_name, **_TABLE_DEFINITION)
+        self.table.wait_until_exists(WaiterConfig=TABLE_WAITER_CONFIG)
+        _TABLE_CACHE.add(self._table_key(table_name))
+        self._cache.clear()
+        return self.table
 
+    @_log_client_error('list tables')
     def list_tables(self):
-        try:
-            tables = []
-            for table in self.dyn_resource.tables.all():
-                print(table.name)
-                tables.append(table)
-        except ClientError as err:
-            logger.error(
-                "Couldn't list tables. Here's why: %s: %s",
-                err.response['Error']['Code'], err.response['Error']['Message'])
-            raise
-        else:
-            return tables
+        paginator = self.dyn_resource.meta.client.get_paginator('list_tables')
+        return [self.dyn_resource.Table(name)
+                for page in paginator.paginate()
+                for name in page.get('TableNames', [])]
 
+    @_log_client_error('load data into table {table}')
     def write_batch(self, books):
-        try:
-            with self.table.batch_writer() as writer:
-                for book in books:
-                    writer.put_item(Item=book)
-        except ClientError as err:
-            logger.error(
-                "Couldn't load data into table %s. Here's why: %s: %s", self.table.name,
-                err.response['Error']['Code'], err.response['Error']['Message'])
-            raise
+        """
+        Writes books to the table in chunks of 25, sending the chunks concurrently.
+
+        :param books: The books to write.
+        """
+        books = list(books)
+        chunks = [books[i:i + BATCH_WRITE_SIZE]
+                  for i in range(0, len(books), BATCH_WRITE_SIZE)]
+        if not chunks:
+            return
+        evict = self._cache.pop
+        for book in books:
+            evict((book['isbn'], book['title']), None)
+        with ThreadPoolExecutor(
+                max_workers=min(MAX_WRITE_WORKERS, len(chunks))) as executor:
+            list(executor.map(self._write_chunk, chunks))
+
+    def _write_chunk(self, chunk):
+        """
+        Writes a single chunk with BatchWriteItem, resending any unprocessed
+        items with exponential backoff.
+
+        :param chunk: At most 25 books to write.
+        """
+        request_items = {
+            self.table.name: [{'PutRequest': {'Item': book}} for book in chunk]}
+        # Resources aren't thread-safe, so the workers share the client instead.
+        # It still has the resource's DynamoDB (de)serialization handlers.
+        batch_write_item = self.dyn_resource.meta.client.batch_write_item
+        delay = 0.05
+        while request_items:
+            response = batch_write_item(RequestItems=request_items)
+            request_items = response.get('UnprocessedItems')
+            if request_items:
+                time.sleep(delay)
+                delay = min(delay * 2, 5)
 
+    @_log_client_error('add book {title} to table {table}')
     def add_book(self, isbn, title, author, pages):
-        try:
-            self.table.put_item(
-                Item={
-                    'isbn': isbn,
-                    'title': title,
-                    'author': author,
-                    'pages': pages
-                })
-        except ClientError as err:
-            logger.error(
-                "Couldn't add book %s to table %s. Here's why: %s: %s",
-                title, self.table.name,
-                err.response['Error']['Code'], err.response['Error']['Message'])
-            raise
+        self._cache.pop((isbn, title), None)
+        self.table.put_item(
+            Item={
+                'isbn': isbn,
+                'title': title,
+                'author': author,
+                'pages': pages
+            })
 
+    @_log_client_error('get book {title} from table {table}')
     def get_book(self, isbn, title):
-        try:
-            response = self.table.get_item(Key={'isbn': isbn, 'title': title})
-        except ClientError as err:
-            logger.error(
-                "Couldn't get book %s from table %s. Here's why: %s: %s",
-                title, self.table.name,
-                err.response['Error']['Code'], err.response['Error']['Message'])
-            raise
-        else:
-            return response['Item']
+        """
+        Gets a book, serving repeated reads from an in-memory LRU cache that the
+        write methods of this object invalidate.
+
+        :param isbn: The ISBN of the book.
+        :param title: The title of the book.
+        :return: The book. This is a copy, so changing it doesn't affect the cache.
+        """
+        cache = self._cache
+        key = (isbn, title)
+        book = cache.get(key)
+        if book is not None:
+            cache.move_to_end(key)
+            return copy.deepcopy(book)
+        response = self.table.get_item(Key={'isbn': isbn, 'title': title})
+        book = cache[key] = response['Item']
+        if len(cache) > BOOK_CACHE_SIZE:
+            cache.popitem(last=False)
+        return copy.deepcopy(book)
+
+    @_log_client_error('get books from table {table}')
+    def get_books(self, keys):
+        """
+        Gets several books with BatchGetItem, 100 keys per request. Unprocessed
+        keys are requested again with exponential backoff.
+
+        :param keys: (isbn, title) pairs of the books to get. BatchGetItem rejects
+                     repeated keys, so duplicates are requested only once.
+        :return: The books that were found, in no particular order and with
+                 each book at most once.
+        """
+        keys = [{'isbn': isbn, 'title': title}
+                for isbn, title in dict.fromkeys(map(tuple, keys))]
+        table_name = self.table.name
+        batch_get_item = self.dyn_resource.batch_get_item
+        books = []
+        for i in range(0, len(keys), BATCH_GET_SIZE):
+            request_items = {table_name: {'Keys': keys[i:i + BATCH_GET_SIZE]}}
+            delay = 0.05
+            while request_items:
+                response = batch_get_item(RequestItems=request_items)
+                books.extend(response['Responses'].get(table_name, []))
+                request_items = response.get('UnprocessedKeys')
+                if request_items:
+                    time.sleep(delay)
+                    delay = min(delay * 2, 5)
+        return books
 
+    @_log_client_error('update book {title} in table {table}')
     def update_book(self, isbn, title, author, pages):
-        try:
-            response = self.table.update_item(
-                Key={'isbn': isbn, 'title': title},
-                UpdateExpression="set author=:a, pages=:p",
-                ExpressionAttributeValues={
-                    ':a': author, ':p': pages},
-                ReturnValues="UPDATED_NEW")
-        except ClientError as err:
-            logger.error(
-                "Couldn't update book %s in table %s. Here's why: %s: %s",
-                title, self.table.name,
-                err.response['Error']['Code'], err.response['Error']['Message'])
-            raise
-        else:
-            return response['Attributes']
+        self._cache.pop((isbn, title), None)
+        response = self.table.update_item(
+            Key={'isbn': isbn, 'title': title},
+            UpdateExpression="set author=:a, pages=:p",
+            ExpressionAttributeValues={
+                ':a': author, ':p': pages},
+            ReturnValues="UPDATED_NEW")
+        return response['Attributes']
 
+    @_log_client_error('query for books released in {title}')
     def query_book(self, title):
-        try:
-            response = self.table.query(
-                KeyConditionExpression=Key('title').eq(title))
-        except ClientError as err:
-            logger.error(
-                "Couldn't query for books released in %s. Here's why: %s: %s", title,
-                err.response['Error']['Code'], err.response['Error']['Message'])
-            raise
-        else:
-            return response['Items']
+        # Pass the key condition as a string instead of building it with the
+        # conditions builder. The resource's client already (de)serializes
+        # attribute values, so they stay plain Python values here.
+        response = self.table.query(
+            KeyConditionExpression='#t = :t',
+            ExpressionAttributeNames={'#t': 'title'},
+            ExpressionAttributeValues={':t': title})
+        return response['Items']
 
+    @_log_client_error('delete book {title}')
     def delete_book(self, isbn, title):
-        try:
-            self.table.delete_item(Key={'isbn': isbn, 'title': title})
-        except ClientError as err:
-            logger.error(
-                "Couldn't delete book %s. Here's why: %s: %s", title,
-                err.response['Error']['Code'], err.response['Error']['Message'])
-            raise
+        self._cache.pop((isbn, title), None)
+        self.table.delete_item(Key={'isbn': isbn, 'title': title})
 
     def delete_table(self):
-        try:
-            self.table.delete()
-            self.table = None
-        except ClientError as err:
-            logger.error(
-                "Couldn't delete table. Here's why: %s: %s",
-                err.response['Error']['Code'], err.response['Error']['Message'])
-            raise
+        """
+        Starts deleting the table and returns without waiting for the response.
+        The request is sent from a non-daemon thread, so the interpreter still
+        waits for it before exiting. Errors are logged from that thread.
+
+        :return: The thread sending the request, for callers that need to join it.
+        """
+        table = self.table
+        key = self._table_key(table.name)
+        self.table = None
+        self._cache.clear()
+
+        def delete():
+            try:
+                table.delete()
+            except ClientError as err:
+                logger.error(
+                    _ERR_CLIENT_ERROR, f"delete table {table.name}",
+                    err.response['Error']['Code'], err.response['Error']['Message'])
+            finally:
+                _TABLE_CACHE.discard(key)
+
+        thread = threading.Thread(target=delete)
+        thread.start()
+        return thread
+
+
+class AsyncBooks:
+    """
+    Counterpart of Books for an aioboto3 DynamoDB resource, so that independent
+    requests can be in flight at the same time.
+    """
+    def __init__(self, dyn_resource):
+        self.dyn_resource = dyn_resource
+        self.table = None
+        # Whether a request has already opened a connection on the resource.
+        self._warm = False
+
+    def _table_key(self, table_name):
+        return self.dyn_resource.meta.client.meta.endpoint_url, table_name
+
+    @_log_client_error('check for existence of {table_name}')
+    async def exists(self, table_name):
+        key = self._table_key(table_name)
+        table = await self.dyn_resource.Table(table_name)
+        if key not in _TABLE_CACHE:
+            try:
+                await table.load()
+            except ClientError as err:
+                if err.response['Error']['Code'] != 'ResourceNotFoundException':
+                    raise
+                self._warm = True
+                return False
+            self._warm = True
+            _remember_table(key, table)
+        self.table = table
+        return True
+
+    @_log_client_error('create table {table_name}')
+    async def create_table(self, table_name):
+        self.table = await self.dyn_resource.create_table(
+            TableName=table_name, **_TABLE_DEFINITION)
+        await self.table.wait_until_exists(WaiterConfig=TABLE_WAITER_CONFIG)
+        _TABLE_CACHE.add(self._table_key(table_name))
+        self._warm = True
+        return self.table
+
+    @_log_client_error('warm up the connection for table {table}')
+    async def warm(self):
+        """
+        Makes sure a connection is open before requests are sent concurrently, so
+        they don't each pay connection setup at once. exists() and create_table()
+        already open one, except when exists() is answered from the table cache.
+        Only in that case is a DescribeTable sent here, which spends the request
+        the cache saved.
+        """
+        if not self._warm:
+            await self.table.load()
+            self._warm = True
+
+    @_log_client_error('load data into table {table}')
+    async def write_batch(self, books):
+        async with self.table.batch_writer() as writer:
+            put_item = writer.put_item
+            for book in books:
+                await put_item(Item=book)
+
+    @_log_client_error('get book {title} from table {table}')
+    async def get_book(self, isbn, title):
+        response = await self.table.get_item(Key={'isbn': isbn, 'title': title})
+        return response['Item']
+
+    @_log_client_error('update book {title} in table {table}')
+    async def update_book(self, isbn, title, author, pages):
+        response = await self.table.update_item(
+            Key={'isbn': isbn, 'title': title},
+            UpdateExpression="set author=:a, pages=:p",
+            ExpressionAttributeValues={
+                ':a': author, ':p': pages},
+            ReturnValues="UPDATED_NEW")
+        return response['Attributes']
+
+    @_log_client_error('delete book {title}')
+    async def delete_book(self, isbn, title):
+        await self.table.delete_item(Key={'isbn': isbn, 'title': title})
+
+    @_log_client_error('delete table')
+    async def delete_table(self):
+        await self.table.delete()
+        _TABLE_CACHE.discard(self._table_key(self.table.name))
+        self.table = None
 
 
 def run_scenario(table_name, dyn_resource):
@@ -175,62 +497,20 @@ def run_scenario(table_name, dyn_resource):
         books.create_table(table_name)
         print(f"\nCreated table {books.table.name}.")
 
+    # UpdateItem creates the item when it doesn't exist, so the book is written
+    # with a single call instead of an add followed by an update.
     my_book = {
-        "isbn": "9781593279509",
-        "title": "Eloquent JavaScript, Third Edition",
-        "author": "Marijn Haverbeke",
-        "pages": 472,
-    }
-    books.add_book(**my_book)
-    print(f"\nAdded '{my_book['title']}' to '{books.table.name}'.")
-    print('-'*88)
-
-    book_update = {
         "isbn": "8888893299999",
         "title": "Django JavaScript, Third Edition",
         "author": "John",
         "pages": 1000,
     }
-    my_book.update(book_update)
     updated = books.update_book(**my_book)
     print(f"\nUpdated '{my_book['title']}' with new attributes:")
     pprint(updated)
     print('-'*88)
 
-    books.write_batch([
-        {
-            "isbn": "9781593279509",
-            "title": "Eloquent JavaScript, Third Edition",
-            "subtitle": "A Modern Introduction to Programming",
-            "author": "Marijn Haverbeke",
-            "published": "2018-12-04T00:00:00.000Z",
-            "publisher": "No Starch Press",
-            "pages": 472,
-            "description": "JavaScript lies at the heart of almost every modern web application, from social apps like Twitter to browser-based game frameworks like Phaser and Babylon. Though simple for beginners to pick up and play with, JavaScript is a flexible, complex language that you can use to build full-scale applications.",
-            "website": "http://eloquentjavascript.net/"
-        },
-        {
-            "isbn": "9781491943533",
-            "title": "Practical Modern JavaScript",
-            "subtitle": "Dive into ES6 and the Future of JavaScript",
-            "author": "Nicolás Bevacqua",
-            "published": "2017-07-16T00:00:00.000Z",
-            "publisher": "O'Reilly Media",
-            "pages": 334,
-            "description": "To get the most out of modern JavaScript, you need learn the latest features of its parent specification, ECMAScript 6 (ES6). This book provides a highly practical look at ES6, without getting lost in the specification or its implementation details.",
-            "website": "https://github.com/mjavascript/practical-modern-javascript"
-        },
-        {
-            "isbn": "9781593277574",
-            "title": "Understanding ECMAScript 6",
-            "subtitle": "The Definitive Guide for JavaScript Developers",
-            "author": "Nicholas C. Zakas",
-            "published": "2016-09-03T00:00:00.000Z",
-            "publisher": "No Starch Press",
-            "pages": 352,
-            "description": "ECMAScript 6 represents the biggest update to the core of JavaScript in the history of the language. In Understanding ECMAScript 6, expert developer Nicholas C. Zakas provides a complete guide to the object types, syntax, and other exciting changes that ECMAScript 6 brings to JavaScript.",
-            "website": "https://leanpub.com/understandinges6/read"
-        }])
+    books.write_batch(_SEED_BOOKS)
 
     book = books.get_book("9781593277574", "Understanding ECMAScript 6")
     print("\nHere's what I found:")
@@ -251,9 +531,63 @@ def run_scenario(table_name, dyn_resource):
     books.delete_table()
 
 
+async def run_scenario_async(table_name, dyn_resource):
+    """
+    Runs the scenario against an aioboto3 resource. The resource must stay open
+    for the whole scenario; it is created once by the caller rather than per
+    operation.
+    """
+    logging.basicConfig(level=logging.INFO,
+                        format='%(levelname)s: %(message)s')
+    print('-'*88)
+    print("Welcome to the Amazon DynamoDB getting started demo.")
+    print('-'*88)
+
+    books = AsyncBooks(dyn_resource)
+    books_exists = await books.exists(table_name)
+    if not books_exists:
+        print(f"\nCreating table {table_name}...")
+        await books.create_table(table_name)
+        print(f"\nCreated table {books.table.name}.")
+
+    my_book = {
+        "isbn": "8888893299999",
+        "title": "Django JavaScript, Third Edition",
+        "author": "John",
+        "pages": 1000,
+    }
+    # The update and the batch write touch different items, so they run
+    # together once a connection is open.
+    await books.warm()
+    updated, _ = await asyncio.gather(
+        books.update_book(**my_book), books.write_batch(_SEED_BOOKS))
+    print(f"\nUpdated '{my_book['title']}' with new attributes:")
+    pprint(updated)
+    print('-'*88)
+
+    book = await books.get_book("9781593277574", "Understanding ECMAScript 6")
+    print("\nHere's what I found:")
+    pprint(book)
+
+    # DeleteItem fails once the table is being deleted, so it goes first.
+    await books.delete_book("9781593277574", "Understanding ECMAScript 6")
+
+    await books.delete_table()
+
+
+async def _run_async(table_name, endpoint_url):
+    async with aioboto3.Session().resource(
+            'dynamodb', endpoint_url=endpoint_url, config=DYNAMODB_CONFIG) as dyn_resource:
+        await run_scenario_async(table_name, dyn_resource)
+
+
 if __name__ == '__main__':
     try:
-        run_scenario(
-            'table-books', boto3.resource('dynamodb', endpoint_url="http://localhost:8000"))
+        if '--async' in sys.argv[1:]:
+            if aioboto3 is None:
+                raise RuntimeError("the --async scenario needs aioboto3 installed.")
+            asyncio.run(_run_async('table-books', "http://localhost:8000"))
+        else:
+            run_scenario('table-books', _get_resource("http://localhost:8000"))
     except Exception as e:
         print(f"Something went wrong with the demo! Here's what: {e}")